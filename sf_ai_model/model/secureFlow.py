@@ -1,12 +1,15 @@
 import sys
 import os
+import gc
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from utils import data_generator as dg
+from utils.feature_schema import FEATURE_SPECS, FEATURE_NAMES, FEATURE_INDEX, clock_features
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import IsolationForest, RandomForestClassifier
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.model_selection import train_test_split
+from numba import njit
+from sklearn.ensemble import IsolationForest, HistGradientBoostingClassifier
+from sklearn.preprocessing import LabelEncoder
+from sklearn.model_selection import ShuffleSplit
 from sklearn.metrics import classification_report, confusion_matrix
 import joblib
 from datetime import datetime, timedelta
@@ -14,10 +17,99 @@ import json
 import warnings
 warnings.filterwarnings('ignore')
 
+# Physical cores for parallel Isolation Forest building and bulk scoring; hyperthreads add little here
+_PHYSICAL_CORES = joblib.cpu_count(only_physical_cores=True)
+
+# Below this many rows, thread dispatch costs more than parallel tree scoring saves
+_PARALLEL_SCORING_MIN_ROWS = 1024
+
+# Isolation Forest draws max_samples rows per tree, so a bounded subsample of legitimate rows suffices
+_IF_MAX_SAMPLES = 256
+_IF_MAX_TRAIN_ROWS = 50000
+
+# Rows of a user's baseline_features array
+BASELINE_STATS = ('mean', 'std', 'min', 'max', 'percentile_25', 'percentile_75')
+_MEAN_ROW = BASELINE_STATS.index('mean')
+_STD_ROW = BASELINE_STATS.index('std')
+
+# Column indices of the features behind the hard-coded high-risk indicators
+_PANIC_IDX = FEATURE_INDEX['panic_gesture_triggered']
+_SENSITIVE_IDX = FEATURE_INDEX['direct_to_sensitive']
+_LOCATION_IDX = FEATURE_INDEX['location_familiarity']
+_TREMOR_IDX = FEATURE_INDEX['tremor_signature']
+
+# Risk factors reported for the alerts raised by _risk_kernel, in alert order
+_ALERT_MESSAGES = (
+    "Panic gesture detected",
+    "Direct access to sensitive area",
+    "Unfamiliar location",
+    "Biometric signature mismatch"
+)
+
+@njit(cache=True)
+def _risk_kernel(X, mean_vec, inv_std, panic_idx, sens_idx, loc_idx, tremor_idx):
+    """Risk scores, z-scores and high-risk alerts for each row of X against one baseline"""
+    n, n_features = X.shape
+    risk_scores = np.empty(n)
+    z_scores = np.empty((n, n_features), dtype=np.float32)
+    alerts = np.zeros((n, 4), dtype=np.bool_)
+    
+    for i in range(n):
+        # Calculate deviations from baseline
+        total_deviation = 0.0
+        for j in range(n_features):
+            z = abs(X[i, j] - mean_vec[j]) * inv_std[j]
+            z_scores[i, j] = z
+            if z > 2:
+                total_deviation += z
+        
+        # Specific high-risk indicators
+        if X[i, panic_idx] == 1:
+            alerts[i, 0] = True
+            total_deviation += 5
+        if X[i, sens_idx] == 1:
+            alerts[i, 1] = True
+            total_deviation += 3
+        if X[i, loc_idx] < 0.3:
+            alerts[i, 2] = True
+            total_deviation += 2
+        if X[i, tremor_idx] < 0.7:
+            alerts[i, 3] = True
+            total_deviation += 4
+        
+        # Normalize risk score
+        risk_scores[i] = max(min(total_deviation / 10, 1.0), 0.05)
+    
+    return risk_scores, z_scores, alerts
+
+def _build_row_extractor():
+    """Generate a straight-line single-session extractor from FEATURE_SPECS"""
+    groups = []
+    values = []
+    for name, path, default in FEATURE_SPECS:
+        if path is None:
+            values.append(f"clock[{name!r}]")
+        elif len(path) == 1:
+            values.append(f"s.get({path[0]!r}, {default!r})")
+        else:
+            group, key = path
+            if group not in groups:
+                groups.append(group)
+            values.append(f"g{groups.index(group)}.get({key!r}, {default!r})")
+    
+    # Each nested group is looked up once, then all features are written with a single assignment
+    lines = ["def _fill_row(s, out, clock):"]
+    lines += [f"    g{i} = s.get({group!r}, _EMPTY)" for i, group in enumerate(groups)]
+    lines.append("    out[:] = (" + ", ".join(values) + ")")
+    namespace = {'_EMPTY': {}}
+    exec("\n".join(lines), namespace)
+    return namespace['_fill_row']
+
+_fill_row = _build_row_extractor()
+
 class BehavioralAuthModel:
     def __init__(self):
         self.models = {}
-        self.scalers = {}
         self.encoders = {}
         self.user_profiles = {}
         self.risk_thresholds = {
@@ -25,86 +117,82 @@ class BehavioralAuthModel:
             'medium': 0.6,
             'high': 0.8
         }
+        # Compile (or load the cached) risk kernel now rather than on the first request
+        n_features = len(FEATURE_SPECS)
+        _risk_kernel(
+            np.zeros((1, n_features), dtype=np.float32), np.zeros(n_features, dtype=np.float32),
+            np.ones(n_features, dtype=np.float32), _PANIC_IDX, _SENSITIVE_IDX, _LOCATION_IDX, _TREMOR_IDX
+        )
         
-    def extract_features(self, user_data):
+    def extract_features(self, user_data, now=None):
         """Extract features from user interaction data"""
-        features = {}
-        
-        # 1. Behavioral Profiling Features
-        features['login_frequency'] = user_data.get('daily_login_count', 0)
-        features['session_duration'] = user_data.get('session_time', 0)
-        features['hour_of_day'] = datetime.now().hour
-        features['day_of_week'] = datetime.now().weekday()
-        
-        # 2. Keystroke & Gesture Dynamics
-        keystroke_data = user_data.get('keystroke_dynamics', {})
-        features['avg_typing_speed'] = keystroke_data.get('avg_speed', 0)
-        features['typing_rhythm_variance'] = keystroke_data.get('rhythm_variance', 0)
-        features['tap_pressure'] = keystroke_data.get('avg_pressure', 0)
-        features['swipe_velocity'] = keystroke_data.get('swipe_velocity', 0)
-        
-        # 3. Navigation & Session Flow
-        navigation = user_data.get('navigation_pattern', {})
-        features['typical_screen_sequence'] = navigation.get('screen_sequence_score', 0)
-        features['direct_to_sensitive'] = navigation.get('direct_sensitive_access', 0)
-        features['page_dwell_time'] = navigation.get('avg_dwell_time', 0)
-        
-        # 4. Transaction Habits
-        transaction = user_data.get('transaction_data', {})
-        features['transaction_amount'] = transaction.get('amount', 0)
-        features['payee_familiarity'] = transaction.get('payee_score', 1)
-        features['transaction_frequency'] = transaction.get('frequency', 0)
-        features['balance_check_frequency'] = transaction.get('balance_checks', 0)
-        
-        # 5. Location & Context
-        location = user_data.get('location_data', {})
-        features['location_familiarity'] = location.get('familiarity_score', 1)
-        features['wifi_pattern_match'] = location.get('wifi_match', 1)
-        features['bluetooth_devices'] = location.get('bluetooth_count', 0)
-        features['travel_distance'] = location.get('travel_distance', 0)
-        
-        # 6. Hand-Tremor Micro Signature
-        biometric = user_data.get('biometric_data', {})
-        features['tremor_signature'] = biometric.get('tremor_match_score', 1)
-        features['gyroscope_pattern'] = biometric.get('gyro_similarity', 1)
-        features['accelerometer_pattern'] = biometric.get('accel_similarity', 1)
-        
-        # 7. Secret Gesture
-        features['panic_gesture_triggered'] = user_data.get('panic_gesture', 0)
-        
-        # 8. Decoy Screen Response
-        features['decoy_interaction_normal'] = user_data.get('decoy_response', 1)
-        
-        return features
+        feature_vector = self._extract_row(user_data, now)[0]
+        return dict(zip(FEATURE_NAMES, feature_vector.tolist()))
+    
+    def _extract_row(self, session, now=None):
+        """Extract one session into a new (1, F) feature row"""
+        row = np.empty((1, len(FEATURE_SPECS)), dtype=np.float32)
+        if now is None:
+            now = datetime.now()
+        _fill_row(session, row[0], clock_features(now))
+        return row
+    
+    def extract_features_batch(self, sessions, now=None):
+        """Extract the feature matrix for a batch of sessions (one row per session)"""
+        X = np.empty((len(sessions), len(FEATURE_SPECS)), dtype=np.float32)
+        
+        # Clock features are constant across the batch; callers may pass their own 'now'
+        if now is None:
+            now = datetime.now()
+        clock = clock_features(now)
+        
+        for j, (name, path, default) in enumerate(FEATURE_SPECS):
+            if path is None:
+                X[:, j] = clock[name]
+            elif len(path) == 1:
+                key = path[0]
+                X[:, j] = [session.get(key, default) for session in sessions]
+            else:
+                group, key = path
+                X[:, j] = [session.get(group, {}).get(key, default) for session in sessions]
+        
+        return X
     
     def build_user_profile(self, user_id, historical_data):
         """Build baseline profile for a user"""
         profile = {
             'user_id': user_id,
-            'baseline_features': {},
+            'baseline_features': None,
             'behavioral_patterns': {},
             'risk_factors': []
         }
         
-        # Calculate baseline statistics
-        for session in historical_data:
-            features = self.extract_features(session)
-            for key, value in features.items():
-                if key not in profile['baseline_features']:
-                    profile['baseline_features'][key] = []
-                profile['baseline_features'][key].append(value)
-        
-        # Compute statistical measures
-        for key, values in profile['baseline_features'].items():
-            values = np.array(values)
-            profile['baseline_features'][key] = {
-                'mean': np.mean(values),
-                'std': np.std(values),
-                'min': np.min(values),
-                'max': np.max(values),
-                'percentile_25': np.percentile(values, 25),
-                'percentile_75': np.percentile(values, 75)
-            }
+        # Historical data may be sessions or an already extracted feature matrix
+        if isinstance(historical_data, np.ndarray):
+            X = historical_data
+        else:
+            X = self.extract_features_batch(historical_data)
+        
+        # Without history there is no baseline; scoring then relies on the high-risk indicators only
+        if len(X) == 0:
+            self.user_profiles[user_id] = profile
+            return profile
+        
+        # Compute statistical measures: one contiguous row per statistic (in BASELINE_STATS order),
+        # columns in canonical feature order
+        percentile_25, percentile_75 = np.percentile(X, [25, 75], axis=0)
+        stats = {
+            'mean': X.mean(axis=0),
+            'std': X.std(axis=0),
+            'min': X.min(axis=0),
+            'max': X.max(axis=0),
+            'percentile_25': percentile_25,
+            'percentile_75': percentile_75
+        }
+        baseline = np.empty((len(BASELINE_STATS), len(FEATURE_SPECS)), dtype=np.float32)
+        for row, stat in enumerate(BASELINE_STATS):
+            baseline[row] = stats[stat]
+        profile['baseline_features'] = baseline
         
         self.user_profiles[user_id] = profile
         return profile
@@ -112,142 +200,140 @@ class BehavioralAuthModel:
     def train_models(self, training_data):
         """Train the behavioral authentication models"""
         
-        # Prepare training data
-        X = []
-        y = []
-        
-        for session in training_data:
-            features = self.extract_features(session)
-            feature_vector = list(features.values())
-            X.append(feature_vector)
-            y.append(session.get('is_legitimate', 1))  # 1 = legitimate, 0 = fraudulent
-        
-        X = np.array(X)
-        y = np.array(y)
-        
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-        
-        # Scale features
-        self.scalers['main'] = StandardScaler()
-        X_train_scaled = self.scalers['main'].fit_transform(X_train)
-        X_test_scaled = self.scalers['main'].transform(X_test)
-        
-        # Train Random Forest for classification
-        self.models['random_forest'] = RandomForestClassifier(
-            n_estimators=100,
-            max_depth=10,
+        # Prepare training data; an (X, y) tuple is already in feature-matrix form
+        if isinstance(training_data, tuple):
+            X, y = training_data
+        else:
+            X = self.extract_features_batch(training_data)
+            y = np.array([session.get('is_legitimate', 1) for session in training_data])  # 1 = legitimate, 0 = fraudulent
+        
+        # Keep the feature matrix in float32 through tree fitting
+        X = X.astype(np.float32, copy=False)
+        
+        # Split data by index so each row is copied exactly once
+        splitter = ShuffleSplit(n_splits=1, test_size=0.2, random_state=42)
+        train_idx, test_idx = next(splitter.split(X))
+        X_train, X_test = X[train_idx], X[test_idx]
+        y_train, y_test = y[train_idx], y[test_idx]
+        del X
+        
+        # Train histogram gradient boosting for classification; tree models need no feature scaling
+        self.models['hgbt'] = HistGradientBoostingClassifier(
+            max_iter=200,
+            max_depth=8,
+            learning_rate=0.1,
+            early_stopping=True,
             random_state=42
         )
-        self.models['random_forest'].fit(X_train_scaled, y_train)
+        self.models['hgbt'].fit(X_train, y_train)
+        hgbt_pred = self.models['hgbt'].predict(X_test)
+        
+        # Keep only (a subsample of) the legitimate rows and release the training matrix before the next fit
+        legit_idx = np.flatnonzero(y_train == 1)
+        if len(legit_idx) > _IF_MAX_TRAIN_ROWS:
+            rng = np.random.default_rng(42)
+            legit_idx = np.sort(rng.choice(legit_idx, _IF_MAX_TRAIN_ROWS, replace=False))
+        X_legit = X_train[legit_idx]
+        del X_train
+        gc.collect()
         
         # Train Isolation Forest for anomaly detection
         self.models['isolation_forest'] = IsolationForest(
             contamination=0.1,
+            max_samples=_IF_MAX_SAMPLES,
+            n_jobs=_PHYSICAL_CORES,
             random_state=42
         )
-        self.models['isolation_forest'].fit(X_train_scaled[y_train == 1])  # Train only on legitimate users
+        self.models['isolation_forest'].fit(X_legit)  # Train only on legitimate users
         
         # Evaluate models
-        rf_pred = self.models['random_forest'].predict(X_test_scaled)
-        if_pred = self.models['isolation_forest'].predict(X_test_scaled)
+        if_pred = self.models['isolation_forest'].predict(X_test)
         if_pred = np.where(if_pred == 1, 1, 0)  # Convert to binary
         
-        print("Random Forest Classification Report:")
-        print(classification_report(y_test, rf_pred))
+        print("Gradient Boosting Classification Report:")
+        print(classification_report(y_test, hgbt_pred))
         print("\nIsolation Forest Classification Report:")
         print(classification_report(y_test, if_pred))
         
         return self.models
     
-    def calculate_risk_score(self, user_id, current_session):
-        """Calculate risk score for current session"""
-        if user_id not in self.user_profiles:
-            return 0.9  # High risk for unknown user
-        
-        profile = self.user_profiles[user_id]
-        current_features = self.extract_features(current_session)
+    def _score_deviations(self, X, baseline):
+        """Calculate risk scores and risk factors for rows of X against one baseline (or None)"""
+        if baseline is None:
+            # Zero inverse std makes every z-score 0, leaving only the high-risk indicators
+            mean_vec = np.zeros(len(FEATURE_SPECS), dtype=np.float32)
+            inv_std = np.zeros(len(FEATURE_SPECS), dtype=np.float32)
+        else:
+            mean_vec = baseline[_MEAN_ROW]
+            inv_std = 1.0 / np.maximum(baseline[_STD_ROW], 1e-6)  # avoid tiny std
+        risk_scores, z_scores, alerts = _risk_kernel(
+            X, mean_vec, inv_std,
+            _PANIC_IDX, _SENSITIVE_IDX, _LOCATION_IDX, _TREMOR_IDX
+        )
         
+        # Only the human-readable factors are built row by row
         risk_factors = []
-        total_deviation = 0
-        
-        # Calculate deviations from baseline
-        for feature, value in current_features.items():
-            if feature in profile['baseline_features']:
-                baseline = profile['baseline_features'][feature]
-                std = max(baseline['std'], 1e-6)  # avoid tiny std
-                z_score = abs(value - baseline['mean']) / std
-                if z_score > 2:
-                    risk_factors.append(f"{feature}: {z_score:.2f} std devs")
-                    total_deviation += z_score
-
-        
-        # Specific high-risk indicators
-        if current_features.get('panic_gesture_triggered', 0) == 1:
-            risk_factors.append("Panic gesture detected")
-            total_deviation += 5
+        for i in range(len(X)):
+            factors = [f"{FEATURE_NAMES[j]}: {z_scores[i, j]:.2f} std devs" for j in np.flatnonzero(z_scores[i] > 2)]
+            factors.extend(message for message, raised in zip(_ALERT_MESSAGES, alerts[i]) if raised)
+            risk_factors.append(factors)
         
-        if current_features.get('direct_to_sensitive', 0) == 1:
-            risk_factors.append("Direct access to sensitive area")
-            total_deviation += 3
-        
-        if current_features.get('location_familiarity', 1) < 0.3:
-            risk_factors.append("Unfamiliar location")
-            total_deviation += 2
-        
-        if current_features.get('tremor_signature', 1) < 0.7:
-            risk_factors.append("Biometric signature mismatch")
-            total_deviation += 4
+        return risk_scores.tolist(), risk_factors
+    
+    def calculate_risk_score(self, user_id, current_session, now=None):
+        """Calculate risk score for current session"""
+        return self._score_row(user_id, self._extract_row(current_session, now))
+    
+    def _score_row(self, user_id, feature_vector):
+        """Calculate risk score and risk factors for one extracted (1, F) feature row"""
+        if user_id not in self.user_profiles:
+            return 0.9, []  # High risk for unknown user
         
-        # Normalize risk score
-        risk_score = max(min(total_deviation / 10, 1.0), 0.05)
+        baseline = self.user_profiles[user_id]['baseline_features']
+        risk_scores, risk_factors = self._score_deviations(feature_vector, baseline)
         
-        return risk_score, risk_factors
+        return risk_scores[0], risk_factors[0]
+    
+    def _classify_risk(self, risk_score):
+        """Map a risk score to a (classification, action) pair"""
+        if risk_score >= self.risk_thresholds['high']:
+            return 'BLOCK', 'Block transaction and lock session'
+        elif risk_score >= self.risk_thresholds['medium']:
+            return 'CHALLENGE', 'Request additional authentication (OTP/Biometric)'
+        elif risk_score >= self.risk_thresholds['low']:
+            return 'MONITOR', 'Continue with increased monitoring'
+        else:
+            return 'ALLOW', 'Continue normally'
     
     def classify_user(self, user_id, current_session):
         """Main classification function"""
-        # Extract features
-        features = self.extract_features(current_session)
-        feature_vector = np.array(list(features.values())).reshape(1, -1)
-        
-        # Scale features
-        if 'main' in self.scalers:
-            feature_vector_scaled = self.scalers['main'].transform(feature_vector)
-        else:
-            feature_vector_scaled = feature_vector
+        # Extract features, reading the clock once for the whole request
+        now = datetime.now()
+        feature_vector = self._extract_row(current_session, now)
         
         # Get predictions from models
         predictions = {}
         
-        if 'random_forest' in self.models:
-            rf_pred = self.models['random_forest'].predict(feature_vector_scaled)[0]
-            rf_prob = self.models['random_forest'].predict_proba(feature_vector_scaled)[0][1]
-            predictions['random_forest'] = {'prediction': rf_pred, 'confidence': rf_prob}
+        if 'hgbt' in self.models:
+            # predict is argmax of predict_proba, so one pass gives both
+            hgbt_proba = self.models['hgbt'].predict_proba(feature_vector)[0]
+            hgbt_pred = self.models['hgbt'].classes_[hgbt_proba.argmax()].item()
+            hgbt_prob = hgbt_proba[1].item()
+            predictions['hgbt'] = {'prediction': hgbt_pred, 'confidence': hgbt_prob}
         
         if 'isolation_forest' in self.models:
-            if_pred_raw = self.models['isolation_forest'].predict(feature_vector_scaled)[0]
-            if_pred = 1 if if_pred_raw == 1 else 0
-            anomaly_score = self.models['isolation_forest'].decision_function(feature_vector_scaled)[0]
+            # predict flags inliers as decision_function >= 0, so derive it from the score
+            anomaly_score = self.models['isolation_forest'].decision_function(feature_vector)[0].item()
+            if_pred = 1 if anomaly_score >= 0 else 0
             # Normalize anomaly_score to [0,1] (optional: depends on distribution)
             anomaly_confidence = max(min(0.5 + anomaly_score/2, 1.0), 0.0)
             predictions['isolation_forest'] = {'prediction': if_pred, 'confidence': anomaly_confidence}
         
         # Calculate risk score
-        risk_score, risk_factors = self.calculate_risk_score(user_id, current_session)
+        risk_score, risk_factors = self._score_row(user_id, feature_vector)
         
         # Determine final classification
-        if risk_score >= self.risk_thresholds['high']:
-            classification = 'BLOCK'
-            action = 'Block transaction and lock session'
-        elif risk_score >= self.risk_thresholds['medium']:
-            classification = 'CHALLENGE'
-            action = 'Request additional authentication (OTP/Biometric)'
-        elif risk_score >= self.risk_thresholds['low']:
-            classification = 'MONITOR'
-            action = 'Continue with increased monitoring'
-        else:
-            classification = 'ALLOW'
-            action = 'Continue normally'
+        classification, action = self._classify_risk(risk_score)
         
         return {
             'user_id': user_id,
@@ -256,25 +342,90 @@ class BehavioralAuthModel:
             'risk_score': risk_score,
             'risk_factors': risk_factors,
             'model_predictions': predictions,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now.isoformat()
         }
     
+    def classify_users(self, user_ids, sessions):
+        """Bulk classification: score many sessions with one call per model"""
+        if len(user_ids) != len(sessions):
+            raise ValueError(f"Got {len(user_ids)} user ids for {len(sessions)} sessions")
+        n = len(sessions)
+        if n == 0:
+            return []
+        
+        now = datetime.now()
+        X = self.extract_features_batch(sessions, now)
+        
+        # Get predictions from models for the whole batch at once
+        if 'hgbt' in self.models:
+            hgbt_proba = self.models['hgbt'].predict_proba(X)
+            # Plain Python values, matching what classify_user reports
+            hgbt_pred = self.models['hgbt'].classes_[hgbt_proba.argmax(axis=1)].tolist()
+            hgbt_prob = hgbt_proba[:, 1].tolist()
+        
+        if 'isolation_forest' in self.models:
+            # Tree scoring releases the GIL, so threads parallelize it without pickling X
+            n_jobs = _PHYSICAL_CORES if n >= _PARALLEL_SCORING_MIN_ROWS else 1
+            with joblib.parallel_backend('threading', n_jobs=n_jobs):
+                anomaly_scores = self.models['isolation_forest'].decision_function(X)
+            if_pred = np.where(anomaly_scores >= 0, 1, 0).tolist()
+            # Normalize anomaly_score to [0,1] (optional: depends on distribution)
+            anomaly_confidence = np.clip(0.5 + anomaly_scores / 2, 0.0, 1.0).tolist()
+        
+        # Calculate risk scores per user against that user's baseline
+        risk_scores = [0.9] * n  # High risk for unknown users
+        risk_factors = [[] for _ in range(n)]
+        user_rows = {}
+        for i, user_id in enumerate(user_ids):
+            user_rows.setdefault(user_id, []).append(i)
+        for user_id, rows in user_rows.items():
+            if user_id not in self.user_profiles:
+                continue
+            baseline = self.user_profiles[user_id]['baseline_features']
+            scores, factors = self._score_deviations(X[rows], baseline)
+            for i, score, factor_list in zip(rows, scores, factors):
+                risk_scores[i] = score
+                risk_factors[i] = factor_list
+        
+        # Assemble per-session results
+        timestamp = now.isoformat()
+        results = []
+        for i, user_id in enumerate(user_ids):
+            predictions = {}
+            if 'hgbt' in self.models:
+                predictions['hgbt'] = {'prediction': hgbt_pred[i], 'confidence': hgbt_prob[i]}
+            if 'isolation_forest' in self.models:
+                predictions['isolation_forest'] = {'prediction': if_pred[i], 'confidence': anomaly_confidence[i]}
+            
+            classification, action = self._classify_risk(risk_scores[i])
+            results.append({
+                'user_id': user_id,
+                'classification': classification,
+                'action': action,
+                'risk_score': risk_scores[i],
+                'risk_factors': risk_factors[i],
+                'model_predictions': predictions,
+                'timestamp': timestamp
+            })
+        
+        return results
+    
     def save_model(self, filepath):
         """Save trained model to file"""
         model_data = {
             'models': self.models,
-            'scalers': self.scalers,
             'encoders': self.encoders,
             'user_profiles': self.user_profiles,
             'risk_thresholds': self.risk_thresholds
         }
-        joblib.dump(model_data, filepath)
+        # LZ4 shrinks the tree node arrays several-fold and decompresses faster than the disk reads them
+        # Tree thresholds stay float64: sklearn's fixed node dtypes reject float32 node arrays on load
+        joblib.dump(model_data, filepath, compress=('lz4', 3), protocol=5)
     
     def load_model(self, filepath):
         """Load trained model from file"""
         model_data = joblib.load(filepath)
         self.models = model_data['models']
-        self.scalers = model_data['scalers']
         self.encoders = model_data['encoders']
         self.user_profiles = model_data['user_profiles']
         self.risk_thresholds = model_data['risk_thresholds']
@@ -285,11 +436,11 @@ if __name__ == "__main__":
     auth_model = BehavioralAuthModel()
     
     # Generate sample data
-    training_data = dg.generate_sample_data()
+    training_data = dg.generate_sample_matrix()
     
     # Build user profile
-    legitimate_sessions = [s for s in training_data if s['is_legitimate'] == 1]
-    auth_model.build_user_profile('user_001', legitimate_sessions)
+    X, y = training_data
+    auth_model.build_user_profile('user_001', X[y == 1])
     
     # Train models
     print("Training behavioral authentication models...")
@@ -4,90 +4,138 @@ data_generator.py
 Generates synthetic behavioral authentication dataset with legitimate and fraudulent sessions.
 Used for training and testing models in the authentication project.
 """
+from datetime import datetime
+
 import numpy as np
 
-def generate_sample_data():
+from .feature_schema import FEATURE_SPECS, clock_features
+
+# Normally distributed session fields: path into the session dict -> (mean, std)
+_LEGIT_NORMAL_FIELDS = {
+    ('daily_login_count',): (3, 1),
+    ('session_time',): (300, 50),  # 5 minutes average
+    ('keystroke_dynamics', 'avg_speed'): (150, 20),
+    ('keystroke_dynamics', 'rhythm_variance'): (0.2, 0.05),
+    ('keystroke_dynamics', 'avg_pressure'): (0.7, 0.1),
+    ('keystroke_dynamics', 'swipe_velocity'): (200, 30),
+    ('navigation_pattern', 'screen_sequence_score'): (0.8, 0.1),
+    ('navigation_pattern', 'avg_dwell_time'): (10, 3),
+    ('transaction_data', 'amount'): (100, 50),
+    ('transaction_data', 'payee_score'): (0.9, 0.1),
+    ('transaction_data', 'frequency'): (5, 2),
+    ('transaction_data', 'balance_checks'): (2, 1),
+    ('location_data', 'familiarity_score'): (0.9, 0.1),
+    ('location_data', 'wifi_match'): (0.95, 0.05),
+    ('location_data', 'bluetooth_count'): (3, 1),
+    ('location_data', 'travel_distance'): (5, 10),
+    ('biometric_data', 'tremor_match_score'): (0.95, 0.05),
+    ('biometric_data', 'gyro_similarity'): (0.9, 0.1),
+    ('biometric_data', 'accel_similarity'): (0.9, 0.1),
+}
+
+_FRAUD_NORMAL_FIELDS = {
+    ('daily_login_count',): (1, 0.5),  # Less frequent
+    ('session_time',): (600, 100),  # Longer sessions
+    ('keystroke_dynamics', 'avg_speed'): (100, 30),  # Different typing speed
+    ('keystroke_dynamics', 'rhythm_variance'): (0.4, 0.1),  # More variance
+    ('keystroke_dynamics', 'avg_pressure'): (0.5, 0.2),  # Different pressure
+    ('keystroke_dynamics', 'swipe_velocity'): (150, 50),  # Different velocity
+    ('navigation_pattern', 'screen_sequence_score'): (0.3, 0.2),  # Unfamiliar navigation
+    ('navigation_pattern', 'avg_dwell_time'): (5, 2),  # Less dwell time
+    ('transaction_data', 'amount'): (500, 200),  # Higher amounts
+    ('transaction_data', 'payee_score'): (0.2, 0.1),  # Unknown payees
+    ('transaction_data', 'frequency'): (1, 0.5),  # Less frequent
+    ('transaction_data', 'balance_checks'): (5, 2),  # More balance checks
+    ('location_data', 'familiarity_score'): (0.2, 0.1),  # Unfamiliar location
+    ('location_data', 'wifi_match'): (0.1, 0.05),  # No wifi match
+    ('location_data', 'bluetooth_count'): (0, 1),  # No familiar devices
+    ('location_data', 'travel_distance'): (100, 50),  # Far from usual location
+    ('biometric_data', 'tremor_match_score'): (0.3, 0.2),  # Poor biometric match
+    ('biometric_data', 'gyro_similarity'): (0.4, 0.2),
+    ('biometric_data', 'accel_similarity'): (0.4, 0.2),
+}
+
+# Binary session fields: path into the session dict -> probability of being 1
+_LEGIT_BINARY_FIELDS = {
+    ('navigation_pattern', 'direct_sensitive_access'): 0.1,
+    ('panic_gesture',): 0.0,
+    ('decoy_response',): 1.0,
+}
+
+_FRAUD_BINARY_FIELDS = {
+    ('navigation_pattern', 'direct_sensitive_access'): 0.5,  # More direct access
+    ('panic_gesture',): 0.2,  # Occasional panic
+    ('decoy_response',): 0.7,  # Poor decoy response
+}
+
+
+def _draw_fields(rng, n, normal_fields, binary_fields):
+    """Draw every session field for n sessions, one vectorized call per field"""
+    columns = {}
+    for path, (mean, std) in normal_fields.items():
+        columns[path] = rng.normal(mean, std, n)
+    for path, p in binary_fields.items():
+        columns[path] = (rng.random(n) < p).astype(np.int8)
+    return columns
+
+
+def _build_sessions(columns, n, is_legitimate):
+    """Assemble per-session dicts from drawn field columns"""
+    # Convert to Python scalars once per column instead of once per element
+    columns = {path: values.tolist() for path, values in columns.items()}
+
+    sessions = []
+    for i in range(n):
+        session = {'user_id': 'user_001'}
+        for path, values in columns.items():
+            if len(path) == 1:
+                session[path[0]] = values[i]
+            else:
+                session.setdefault(path[0], {})[path[1]] = values[i]
+        session['is_legitimate'] = is_legitimate
+        sessions.append(session)
+    return sessions
+
+
+def generate_sample_data(n_legit=100000, n_fraud=10000, rng=None):
     """Generate sample data for testing"""
-    sample_data = []
-    
+    if rng is None:
+        rng = np.random.default_rng()
+
     # Generate legitimate user sessions
-    for i in range(100000):
-        session = {
-            'user_id': 'user_001',
-            'daily_login_count': np.random.normal(3, 1),
-            'session_time': np.random.normal(300, 50),  # 5 minutes average
-            'keystroke_dynamics': {
-                'avg_speed': np.random.normal(150, 20),
-                'rhythm_variance': np.random.normal(0.2, 0.05),
-                'avg_pressure': np.random.normal(0.7, 0.1),
-                'swipe_velocity': np.random.normal(200, 30)
-            },
-            'navigation_pattern': {
-                'screen_sequence_score': np.random.normal(0.8, 0.1),
-                'direct_sensitive_access': 0 if np.random.random() > 0.1 else 1,
-                'avg_dwell_time': np.random.normal(10, 3)
-            },
-            'transaction_data': {
-                'amount': np.random.normal(100, 50),
-                'payee_score': np.random.normal(0.9, 0.1),
-                'frequency': np.random.normal(5, 2),
-                'balance_checks': np.random.normal(2, 1)
-            },
-            'location_data': {
-                'familiarity_score': np.random.normal(0.9, 0.1),
-                'wifi_match': np.random.normal(0.95, 0.05),
-                'bluetooth_count': np.random.normal(3, 1),
-                'travel_distance': np.random.normal(5, 10)
-            },
-            'biometric_data': {
-                'tremor_match_score': np.random.normal(0.95, 0.05),
-                'gyro_similarity': np.random.normal(0.9, 0.1),
-                'accel_similarity': np.random.normal(0.9, 0.1)
-            },
-            'panic_gesture': 0,
-            'decoy_response': 1,
-            'is_legitimate': 1
-        }
-        sample_data.append(session)
-    
+    legit_columns = _draw_fields(rng, n_legit, _LEGIT_NORMAL_FIELDS, _LEGIT_BINARY_FIELDS)
+    sample_data = _build_sessions(legit_columns, n_legit, 1)
+
     # Generate fraudulent sessions
-    for i in range(10000):
-        session = {
-            'user_id': 'user_001',
-            'daily_login_count': np.random.normal(1, 0.5),  # Less frequent
-            'session_time': np.random.normal(600, 100),  # Longer sessions
-            'keystroke_dynamics': {
-                'avg_speed': np.random.normal(100, 30),  # Different typing speed
-                'rhythm_variance': np.random.normal(0.4, 0.1),  # More variance
-                'avg_pressure': np.random.normal(0.5, 0.2),  # Different pressure
-                'swipe_velocity': np.random.normal(150, 50)  # Different velocity
-            },
-            'navigation_pattern': {
-                'screen_sequence_score': np.random.normal(0.3, 0.2),  # Unfamiliar navigation
-                'direct_sensitive_access': 1 if np.random.random() > 0.5 else 0,  # More direct access
-                'avg_dwell_time': np.random.normal(5, 2)  # Less dwell time
-            },
-            'transaction_data': {
-                'amount': np.random.normal(500, 200),  # Higher amounts
-                'payee_score': np.random.normal(0.2, 0.1),  # Unknown payees
-                'frequency': np.random.normal(1, 0.5),  # Less frequent
-                'balance_checks': np.random.normal(5, 2)  # More balance checks
-            },
-            'location_data': {
-                'familiarity_score': np.random.normal(0.2, 0.1),  # Unfamiliar location
-                'wifi_match': np.random.normal(0.1, 0.05),  # No wifi match
-                'bluetooth_count': np.random.normal(0, 1),  # No familiar devices
-                'travel_distance': np.random.normal(100, 50)  # Far from usual location
-            },
-            'biometric_data': {
-                'tremor_match_score': np.random.normal(0.3, 0.2),  # Poor biometric match
-                'gyro_similarity': np.random.normal(0.4, 0.2),
-                'accel_similarity': np.random.normal(0.4, 0.2)
-            },
-            'panic_gesture': 1 if np.random.random() > 0.8 else 0,  # Occasional panic
-            'decoy_response': 0 if np.random.random() > 0.7 else 1,  # Poor decoy response
-            'is_legitimate': 0
-        }
-        sample_data.append(session)
-    
-    return sample_data
\ No newline at end of file
+    fraud_columns = _draw_fields(rng, n_fraud, _FRAUD_NORMAL_FIELDS, _FRAUD_BINARY_FIELDS)
+    sample_data.extend(_build_sessions(fraud_columns, n_fraud, 0))
+
+    return sample_data
+
+
+def generate_sample_matrix(n_legit=100000, n_fraud=10000, rng=None, now=None):
+    """Generate sample data directly as a feature matrix X and label vector y"""
+    if rng is None:
+        rng = np.random.default_rng()
+
+    n = n_legit + n_fraud
+    X = np.empty((n, len(FEATURE_SPECS)), dtype=np.float32)
+    y = np.zeros(n, dtype=np.int8)
+    y[:n_legit] = 1  # 1 = legitimate, 0 = fraudulent
+
+    legit_columns = _draw_fields(rng, n_legit, _LEGIT_NORMAL_FIELDS, _LEGIT_BINARY_FIELDS)
+    fraud_columns = _draw_fields(rng, n_fraud, _FRAUD_NORMAL_FIELDS, _FRAUD_BINARY_FIELDS)
+
+    if now is None:
+        now = datetime.now()
+    clock = clock_features(now)
+
+    # Fill columns in canonical feature order, legitimate rows first
+    for j, (name, path, _) in enumerate(FEATURE_SPECS):
+        if path is None:
+            X[:, j] = clock[name]
+        else:
+            X[:n_legit, j] = legit_columns[path]
+            X[n_legit:, j] = fraud_columns[path]
+
+    return X, y
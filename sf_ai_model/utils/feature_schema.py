@@ -0,0 +1,56 @@
+"""
+feature_schema.py
+
+Canonical feature layout shared by the authentication model and the synthetic data generator.
+"""
+
+# Canonical feature order: (feature name, path into the session dict, default).
+# Clock features have no path and are filled from the current time.
+FEATURE_SPECS = [
+    # 1. Behavioral Profiling Features
+    ('login_frequency', ('daily_login_count',), 0),
+    ('session_duration', ('session_time',), 0),
+    ('hour_of_day', None, None),
+    ('day_of_week', None, None),
+    
+    # 2. Keystroke & Gesture Dynamics
+    ('avg_typing_speed', ('keystroke_dynamics', 'avg_speed'), 0),
+    ('typing_rhythm_variance', ('keystroke_dynamics', 'rhythm_variance'), 0),
+    ('tap_pressure', ('keystroke_dynamics', 'avg_pressure'), 0),
+    ('swipe_velocity', ('keystroke_dynamics', 'swipe_velocity'), 0),
+    
+    # 3. Navigation & Session Flow
+    ('typical_screen_sequence', ('navigation_pattern', 'screen_sequence_score'), 0),
+    ('direct_to_sensitive', ('navigation_pattern', 'direct_sensitive_access'), 0),
+    ('page_dwell_time', ('navigation_pattern', 'avg_dwell_time'), 0),
+    
+    # 4. Transaction Habits
+    ('transaction_amount', ('transaction_data', 'amount'), 0),
+    ('payee_familiarity', ('transaction_data', 'payee_score'), 1),
+    ('transaction_frequency', ('transaction_data', 'frequency'), 0),
+    ('balance_check_frequency', ('transaction_data', 'balance_checks'), 0),
+    
+    # 5. Location & Context
+    ('location_familiarity', ('location_data', 'familiarity_score'), 1),
+    ('wifi_pattern_match', ('location_data', 'wifi_match'), 1),
+    ('bluetooth_devices', ('location_data', 'bluetooth_count'), 0),
+    ('travel_distance', ('location_data', 'travel_distance'), 0),
+    
+    # 6. Hand-Tremor Micro Signature
+    ('tremor_signature', ('biometric_data', 'tremor_match_score'), 1),
+    ('gyroscope_pattern', ('biometric_data', 'gyro_similarity'), 1),
+    ('accelerometer_pattern', ('biometric_data', 'accel_similarity'), 1),
+    
+    # 7. Secret Gesture
+    ('panic_gesture_triggered', ('panic_gesture',), 0),
+    
+    # 8. Decoy Screen Response
+    ('decoy_interaction_normal', ('decoy_response',), 1),
+]
+FEATURE_NAMES = [name for name, _, _ in FEATURE_SPECS]
+FEATURE_INDEX = {name: i for i, name in enumerate(FEATURE_NAMES)}
+
+
+def clock_features(now):
+    """Values of the clock features (those without a session path) at time 'now'"""
+    return {'hour_of_day': now.hour, 'day_of_week': now.weekday()}